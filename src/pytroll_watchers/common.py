@@ -2,6 +2,13 @@
 
 import datetime
 import time
+from contextlib import suppress
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+
+_END_OF_ITERATION = object()
+# how often, in seconds, a background reader waiting for room in its queue checks if it has been stopped
+_STOP_CHECK_INTERVAL = 0.1
 
 
 def run_every(interval):
@@ -30,3 +37,160 @@ def fromisoformat(datestring):
     except ValueError:
         # for python 3.10
         return datetime.datetime.strptime(datestring, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def batched(iterable, batch_size, commit_timeout=None, maxsize=None):
+    """Group the items of `iterable` into lists.
+
+    A batch is yielded when it has `batch_size` items, or when `commit_timeout` seconds have passed since its first
+    item arrived, whichever comes first. To be able to yield a batch while waiting for the next item, `iterable` is
+    read in a background thread, see `prefetch`.
+
+    Args:
+        iterable: the iterable to take the items from.
+        batch_size: the maximum number of items in a batch.
+        commit_timeout: the maximum time in seconds that can pass between the first item of a batch and the batch being
+            yielded. None (the default) means no timeout.
+        maxsize: the maximum number of items to buffer in the background. None (the default) means `batch_size`.
+
+    Yields:
+        Lists of items, with at most `batch_size` items.
+    """
+    return merge_batched([iterable], batch_size, commit_timeout, maxsize)
+
+
+def merge_batched(iterables, batch_size, commit_timeout=None, maxsize=None):
+    """Iterate over several iterables at once like `merge`, grouping their items into lists like `batched`.
+
+    Args:
+        iterables: the iterables to take the items from.
+        batch_size: the maximum number of items in a batch.
+        commit_timeout: the maximum time in seconds that can pass between the first item of a batch and the batch being
+            yielded. None (the default) means no timeout.
+        maxsize: the maximum number of items to buffer in the background for all the iterables together. None (the
+            default) means `batch_size`.
+
+    Yields:
+        Lists of items, with at most `batch_size` items.
+    """
+    reader = _BackgroundReader(iterables, batch_size if maxsize is None else maxsize)
+    try:
+        yield from _batches_from_reader(reader, batch_size, commit_timeout)
+    finally:
+        reader.stop()
+
+
+def _batches_from_reader(reader, batch_size, commit_timeout):
+    batch = []
+    deadline = None
+    while True:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            item = reader.get(timeout=timeout)
+        except Empty:
+            yield batch
+            batch, deadline = [], None
+            continue
+        if item is _END_OF_ITERATION:
+            break
+        if not batch and commit_timeout is not None:
+            deadline = time.monotonic() + commit_timeout
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch, deadline = [], None
+    if batch:
+        yield batch
+
+
+def prefetch(iterable, maxsize=0):
+    """Iterate over `iterable` in a background thread.
+
+    This allows waiting for the next items (eg on the network) to overlap with the processing of the current ones.
+    Exceptions raised while iterating are re-raised in the consuming thread. When the consumer stops iterating, the
+    background thread stops and closes `iterable` as soon as it gets its next item.
+
+    Args:
+        iterable: the iterable to take the items from.
+        maxsize: the maximum number of items to buffer. When the buffer is full, the background thread waits for items
+            to be consumed. 0 (the default) means no limit.
+
+    Yields:
+        The items of `iterable`, in order.
+    """
+    return merge([iterable], maxsize)
+
+
+def merge(iterables, maxsize=0):
+    """Iterate over several iterables at once, each in its own background thread.
+
+    The items are yielded in the order they are produced. Iteration stops when all the iterables are exhausted, or
+    when one of them raises an exception, which is then re-raised in the consuming thread. See `prefetch` for how the
+    background threads are stopped.
+
+    Args:
+        iterables: the iterables to take the items from.
+        maxsize: the maximum number of items to buffer for all the iterables together. 0 (the default) means no limit.
+
+    Yields:
+        The items of all the `iterables`.
+    """
+    reader = _BackgroundReader(iterables, maxsize)
+    try:
+        while (item := reader.get()) is not _END_OF_ITERATION:
+            yield item
+    finally:
+        reader.stop()
+
+
+class _BackgroundReader:
+    """Read the items of iterables into a common queue, each from its own background thread."""
+
+    def __init__(self, iterables, maxsize=0):
+        """Start reading from `iterables`."""
+        self._queue = Queue(maxsize)
+        self._stopped = Event()
+        self._running = len(iterables)
+        for iterable in iterables:
+            Thread(target=self._read, args=(iterable,), daemon=True).start()
+
+    def get(self, timeout=None):
+        """Get the next item, or `_END_OF_ITERATION` when all the iterables are exhausted.
+
+        Raises:
+            queue.Empty: if no item arrives within `timeout` seconds.
+            Exception: the exception that was raised while iterating.
+        """
+        while self._running:
+            item, error = self._queue.get(timeout=timeout)
+            if error is not None:
+                raise error
+            if item is not _END_OF_ITERATION:
+                return item
+            self._running -= 1
+        return _END_OF_ITERATION
+
+    def stop(self):
+        """Stop reading."""
+        self._stopped.set()
+
+    def _read(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put(item):
+                    break
+            else:
+                self._put(_END_OF_ITERATION)
+        except Exception as err:
+            self._put(None, err)
+        finally:
+            with suppress(AttributeError):
+                iterable.close()
+
+    def _put(self, item, error=None):
+        """Put `item` on the queue, waiting for a free slot unless the reader is stopped. Return True on success."""
+        while not self._stopped.is_set():
+            with suppress(Full):
+                self._queue.put((item, error), timeout=_STOP_CHECK_INTERVAL)
+                return True
+        return False
@@ -3,14 +3,29 @@
 The published messages will contain filesystem information generated by fsspec.
 """
 
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from logging import getLogger
 
 from upath import UPath
 
-from pytroll_watchers.publisher import SecurityError, file_publisher_from_generator, parse_metadata
+from pytroll_watchers.common import merge, merge_batched, prefetch
+from pytroll_watchers.publisher import (
+    SecurityError,
+    file_publisher_from_batched_generator,
+    file_publisher_from_generator,
+    parse_metadata,
+)
 
 logger = getLogger(__name__)
 
+# the maximum number of objects to receive in advance while the previous ones are being processed
+PREFETCH_SIZE = 400
+# the maximum number of buckets to listen to at once, as the minio server accepts a limited number of listeners
+MAX_LISTENERS = 256
+
 
 def file_publisher(config):
     """Publish objects coming from bucket notifications.
@@ -18,25 +33,49 @@ def file_publisher(config):
     Args:
         config: the configuration dictionary, containing in particular an fs_config section, which is the configuration
         for the filesystem watching, will be passed as argument to `file_generator`. The other sections are passed
-        further to ``file_publisher_from_generator``.
+        further to ``file_publisher_from_generator``. If the fs_config section contains `bucket_names` instead of
+        `bucket_name`, all the buckets are watched using `multi_bucket_file_generator`. If the message `atype` is
+        "dataset" and the fs_config section contains `batch_size` (and optionally `commit_timeout`, 1 second by
+        default), the objects are grouped in batches of at most `batch_size` objects, each published as one dataset
+        message (see ``file_publisher_from_batched_generator``). A batch is published at the latest `commit_timeout`
+        seconds after its first object arrived. For other message types, `batch_size` is ignored.
     """
-    fs_config = config["fs_config"]
-    logger.info(f"Starting watch on '{fs_config['bucket_name']}'")
+    fs_config = dict(config["fs_config"])
     if "secret_key" in fs_config.get("storage_options", []):
         raise SecurityError("A secret key cannot be published safely.")
-    generator = file_generator(**fs_config)
-    return file_publisher_from_generator(generator, config)
-
-
-def file_generator(endpoint_url, bucket_name, file_pattern=None, storage_options=None):
+    batch_size = fs_config.pop("batch_size", None)
+    commit_timeout = fs_config.pop("commit_timeout", 1.0)
+    bucket_names = fs_config.pop("bucket_names", None) or [fs_config.pop("bucket_name")]
+    logger.info(f"Starting watch on {', '.join(repr(name) for name in bucket_names)}")
+    if batch_size is not None and config.get("message_config", {}).get("atype") == "dataset":
+        sources = _bucket_file_generators(bucket_names=bucket_names, **fs_config)
+        batches = merge_batched(sources, batch_size, commit_timeout, PREFETCH_SIZE)
+        return file_publisher_from_batched_generator(batches, config)
+    if batch_size is not None:
+        logger.warning("Batching has no effect when not publishing datasets, the objects are published one by one.")
+    return file_publisher_from_generator(multi_bucket_file_generator(bucket_names=bucket_names, **fs_config), config)
+
+
+def file_generator(endpoint_url, bucket_name, file_pattern=None, storage_options=None,
+                   max_reconnection_attempts=100, max_reconnection_delay=30, deduplication_size=4096):
     """Generate new objects appearing in the watched bucket.
 
     Args:
         endpoint_url: The endpoint_url to use.
         bucket_name: The bucket to watch for changes.
         file_pattern: The trollsift pattern to use for matching and extracting metadata from the object name.
-            This can include the prefix if needed.
+            This can include the prefix if needed. A pattern without fields is matched as a glob pattern. The literal
+            part of the pattern before the first field or wildcard is used for filtering the notifications on the
+            server side.
         storage_options: The storage options for the service, for example for specifying a profile to the aws config.
+        max_reconnection_attempts: The number of consecutive times to try reconnecting when the connection to the
+            server is lost, before raising the connection error. The delay between attempts doubles each time,
+            starting from 1 second. Note that the notifications sent by the server while disconnected are lost, as
+            minio does not replay them on reconnection.
+        max_reconnection_delay: The maximum time in seconds to wait between two reconnection attempts.
+        deduplication_size: The number of recent notifications to remember, so that notifications delivered more
+            than once for the same object version (same bucket, key and sequencer) are only yielded once. 0 disables
+            the deduplication.
 
     Returns:
         A tuple of UPath and metadata.
@@ -50,41 +89,157 @@ def file_generator(endpoint_url, bucket_name, file_pattern=None, storage_options
         UPath("s3:///tmp/data/20200428_1000_foo.tif")
 
     """
-    object_metadata = {}
+    source = _bucket_file_generator(endpoint_url, bucket_name, file_pattern, storage_options,
+                                    max_reconnection_attempts, max_reconnection_delay, deduplication_size)
+    yield from prefetch(source, PREFETCH_SIZE)
+
+
+def multi_bucket_file_generator(endpoint_url, bucket_names, file_pattern=None, storage_options=None,
+                                max_reconnection_attempts=100, max_reconnection_delay=30, deduplication_size=4096):
+    """Generate new objects appearing in any of the watched buckets.
+
+    The minio server only allows listening to one bucket per connection, so each bucket gets its own listener,
+    running in its own thread.
+
+    Args:
+        endpoint_url: The endpoint_url to use.
+        bucket_names: The list of buckets to watch for changes. At most `MAX_LISTENERS` buckets can be watched at
+            once.
+        file_pattern: The trollsift pattern to use for matching and extracting metadata from the object names, see
+            `file_generator`.
+        storage_options: The storage options for the service, for example for specifying a profile to the aws config.
+        max_reconnection_attempts: The number of consecutive times to try reconnecting when the connection to the
+            server is lost, see `file_generator`.
+        max_reconnection_delay: The maximum time in seconds to wait between two reconnection attempts.
+        deduplication_size: The number of recent notifications to remember for each bucket for skipping duplicates,
+            see `file_generator`.
+
+    Yields:
+        Tuples of UPath and metadata.
+    """
+    sources = _bucket_file_generators(endpoint_url, bucket_names, file_pattern, storage_options,
+                                      max_reconnection_attempts, max_reconnection_delay, deduplication_size)
+    yield from merge(sources, PREFETCH_SIZE)
 
+
+def _bucket_file_generators(endpoint_url, bucket_names, file_pattern=None, storage_options=None,
+                            max_reconnection_attempts=100, max_reconnection_delay=30, deduplication_size=4096):
+    """Get one (not yet started) file generator per bucket, to be read in the background."""
+    if len(bucket_names) > MAX_LISTENERS:
+        raise ValueError(f"Cannot listen to more than {MAX_LISTENERS} buckets at once, got {len(bucket_names)}.")
+    return [_bucket_file_generator(endpoint_url, bucket_name, file_pattern, storage_options,
+                                   max_reconnection_attempts, max_reconnection_delay, deduplication_size)
+            for bucket_name in bucket_names]
+
+
+def _bucket_file_generator(endpoint_url, bucket_name, file_pattern, storage_options,
+                           max_reconnection_attempts, max_reconnection_delay, deduplication_size):
+    """Generate the paths and metadata for the new objects of one bucket, without prefetching."""
     if storage_options is None:
         storage_options = {}
-    for record in _record_generator(endpoint_url, bucket_name, storage_options):
-        for item in record["Records"]:
-            new_bucket_name = item["s3"]["bucket"]["name"]
-            object_name = item["s3"]["object"]["key"]
-            try:
-                object_metadata = parse_metadata(file_pattern, object_name)
-            except ValueError:
-                continue
+    records = _record_generator(endpoint_url, bucket_name, storage_options, prefix=_static_prefix(file_pattern),
+                                max_reconnection_attempts=max_reconnection_attempts,
+                                max_reconnection_delay=max_reconnection_delay)
+    yield from _files_from_records(records, file_pattern, storage_options, deduplication_size)
 
-            path = UPath(f"s3://{new_bucket_name}/{object_name}", **storage_options)
-            yield path, object_metadata
 
-
-def _record_generator(endpoint_url, bucket_name, storage_options):
-    """Generate records for new objects in the bucket."""
+def _files_from_records(records, file_pattern, storage_options, deduplication_size):
+    """Generate the paths and metadata for the objects in `records` that match the pattern, skipping duplicates."""
+    seen = OrderedDict()
+    for record in records:
+        for item in record["Records"]:
+            if _is_duplicate(item, seen, deduplication_size):
+                continue
+            file_item = _process_record(item, file_pattern, storage_options)
+            if file_item is not None:
+                yield file_item
+
+
+def _is_duplicate(item, seen, deduplication_size):
+    """Check if the record was already seen, remembering the signatures of the last `deduplication_size` records."""
+    s3_info = item["s3"]
+    sequencer = s3_info["object"].get("sequencer")
+    if not deduplication_size or sequencer is None:
+        return False
+    signature = (s3_info["bucket"]["name"], s3_info["object"]["key"], sequencer)
+    if signature in seen:
+        seen.move_to_end(signature)
+        return True
+    seen[signature] = None
+    if len(seen) > deduplication_size:
+        seen.popitem(last=False)
+    return False
+
+
+def _process_record(item, file_pattern, storage_options):
+    """Get the path and metadata for a notification record, or None if the object does not match the pattern."""
+    s3_info = item["s3"]
+    new_bucket_name = s3_info["bucket"]["name"]
+    object_name = s3_info["object"]["key"]
+    try:
+        object_metadata = parse_metadata(file_pattern, object_name)
+    except ValueError:
+        return None
+
+    # building the path from the full url is faster than joining the key to a cached bucket path
+    path = UPath(f"s3://{new_bucket_name}/{object_name}", **storage_options)
+    return path, object_metadata
+
+
+def _static_prefix(file_pattern):
+    """Get the literal part of the file pattern before the first field or wildcard, for filtering server-side."""
+    if file_pattern is None:
+        return None
+    return re.match(r"[^{*?\[]*", file_pattern).group()
+
+
+def _record_generator(endpoint_url, bucket_name, storage_options, prefix=None,
+                      max_reconnection_attempts=100, max_reconnection_delay=30):
+    """Generate records for new objects in the bucket, optionally only for object names starting with `prefix`."""
+    from urllib3.exceptions import HTTPError
+
+    client = _get_client(endpoint_url, storage_options.get("profile"))
+
+    failures = 0
+    while True:
+        try:
+            with client.listen_bucket_notification(
+                bucket_name,
+                prefix=prefix,
+                events=["s3:ObjectCreated:*"],
+            ) as events:
+                for event in events:
+                    failures = 0
+                    yield event
+            return
+        except (ConnectionError, HTTPError) as err:
+            if failures >= max_reconnection_attempts:
+                raise
+            delay = min(2 ** failures, max_reconnection_delay)
+            failures += 1
+            logger.warning(f"Lost connection to '{endpoint_url}' ({err}), reconnecting in {delay} seconds.")
+            time.sleep(delay)
+
+
+def clear_cache():
+    """Clear the cache of minio clients, for example to make changes to the aws config files take effect."""
+    _get_client.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _get_client(endpoint_url, profile=None):
+    """Get the minio client for the endpoint, using the credentials from the aws config `profile` if provided.
+
+    The clients are cached, so that the aws config is only read once per endpoint and profile.
+    """
     from minio import Minio
     from minio.credentials.providers import AWSConfigProvider
 
-    if "profile" in storage_options:
-        credentials = AWSConfigProvider(profile=storage_options["profile"])
+    if profile is not None:
+        credentials = AWSConfigProvider(profile=profile)
     else:
         credentials = None
 
-    client = Minio(endpoint_url,
+    return Minio(endpoint_url,
         credentials=credentials
     )
-
-    with client.listen_bucket_notification(
-        bucket_name,
-        # prefix="my-prefix/",
-        events=["s3:ObjectCreated:*"],
-    ) as events:
-        for event in events:
-            yield event
@@ -1,10 +1,13 @@
 """Common functions for publishing messages."""
 
 import datetime
+import fnmatch
 import json
 import logging
+import re
 from contextlib import closing, contextmanager, suppress
 from copy import deepcopy
+from functools import lru_cache, partial
 from urllib.parse import unquote
 from warnings import warn
 
@@ -57,26 +60,85 @@ def file_publisher_from_generator(generator, config):
           - filesystem: `{"cls": "s3fs.core.S3FileSystem", "protocol": "s3", "args": [], "profile": "my_profile"}`
           - path: `/eodata/Sentinel-3/OLCI/OL_1_EFR___/2024/04/15/S3B_OL_1_EFR____20240415T074029_20240415T074329_20240415T094236_0179_092_035_1620_PS2_O_NR_003.SEN3/Oa02_radiance.nc`
     """  # noqa
+    batches = ([file_item_and_metadata] for file_item_and_metadata in generator)
+    return _publish_batches(batches, config, as_dataset=False)
+
+
+def file_publisher_from_batched_generator(generator, config):
+    """Publish batches of files coming from a generator.
+
+    If the `atype` of the message config is "dataset", each batch is published as a single dataset message, listing
+    all the files of the batch. As the files of a batch can come from different products or times, only the metadata
+    items that are equal for all the files of the batch are added to the message. Otherwise, all the messages of a
+    batch are created before the first one is sent, and they are then sent one by one.
+
+    Args:
+        generator: the generator to use for producing batches of files. The generator must yield lists of tuples of
+            (filename, file_metadata).
+        config: the configuration containing the parameters to use for publishing data. See
+            ``file_publisher_from_generator`` for the details.
+    """
+    as_dataset = config.get("message_config", {}).get("atype") == "dataset"
+    return _publish_batches(generator, config, as_dataset)
+
+
+def _publish_batches(generator, config, as_dataset):
     publisher_config = config.pop("publisher_config")
     publisher = create_publisher_from_dict_config(publisher_config)
     publisher.start()
 
-
     with closing(publisher):
-        for file_item, file_metadata in generator:
-            msg = _create_message(file_item, file_metadata, config)
-            logger.info(f"Sending {str(msg)}")
-            publisher.send(str(msg))
+        for batch in generator:
+            if as_dataset:
+                messages = [_create_dataset_message(batch, config)]
+            else:
+                messages = [_create_message(file_item, file_metadata, config) for file_item, file_metadata in batch]
+            for msg in messages:
+                logger.info(f"Sending {str(msg)}")
+                publisher.send(str(msg))
 
 
 def _create_message(file_item, file_metadata, config):
-    config = deepcopy(config)
-    message_config = config.pop("message_config", dict())
+    return _compose_message(file_metadata, config, partial(prepare_data, file_item))
+
+
+def _create_dataset_message(batch, config):
+    """Create one dataset message for all the files in `batch`, using the metadata common to all the files."""
+    def _prepare_dataset(data_config):
+        dataset = []
+        for file_item, _ in batch:
+            file_location_info = prepare_data(file_item, dict(data_config))
+            dataset.extend(file_location_info.get("dataset", [file_location_info]))
+        return dict(dataset=dataset)
+
+    common_metadata = _common_metadata([file_metadata or dict() for _, file_metadata in batch])
+    return _compose_message(common_metadata, config, _prepare_dataset)
+
+
+def _common_metadata(all_metadata):
+    """Get the metadata items that have the same value in all the metadata dictionaries, merging nested ones."""
+    first, *others = all_metadata
+    common = dict()
+    for key, value in first.items():
+        other_values = [metadata[key] for metadata in others if key in metadata]
+        if len(other_values) < len(others):
+            continue
+        if isinstance(value, dict) and all(isinstance(other, dict) for other in other_values):
+            common[key] = _common_metadata([value, *other_values])
+        elif all(other == value for other in other_values):
+            common[key] = value
+    return common
+
+
+def _compose_message(file_metadata, config, prepare_file_data):
+    """Compose the message from the file metadata, the config, and the data returned by `prepare_file_data`."""
+    # only copy the sections that are modified below, not the whole config
+    message_config = deepcopy(config.get("message_config", dict()))
     unpack = message_config.pop("unpack", None)
     if unpack is not None:
         warn("The `unpack` option should be passed inside the `data_config` section", DeprecationWarning, stacklevel=1)
 
-    data_config = config.pop("data_config", dict())
+    data_config = dict(config.get("data_config", dict()))
 
     if file_metadata and ("data" in file_metadata):
         file_mda = deepcopy(file_metadata)
@@ -88,7 +150,7 @@ def _create_message(file_item, file_metadata, config):
     message_parameters.update(message_config)
     message_parameters.setdefault("data", {})
 
-    file_location_info = prepare_data(file_item, data_config)
+    file_location_info = prepare_file_data(data_config)
     message_parameters["data"].update(file_location_info)
 
     aliases = message_parameters.pop("aliases", {})
@@ -151,7 +213,7 @@ def _build_file_location(file_item, include_dir=None):
     file_location = dict()
     try:
         with dummy_connect(file_item):
-            file_location["filesystem"] = json.loads(file_item.fs.to_json(include_password=False))
+            file_location["filesystem"] = json.loads(_serialize_filesystem(file_item.fs))
 
         file_location["uri"] = as_uri(file_item)
         file_location["path"] = file_item.path
@@ -166,6 +228,12 @@ def _build_file_location(file_item, include_dir=None):
     return file_location
 
 
+@lru_cache(maxsize=32)
+def _serialize_filesystem(fs):
+    """Serialize the filesystem to json, only once per filesystem instance."""
+    return fs.to_json(include_password=False)
+
+
 def as_uri(file_item):
     """Represent file item’s path as an unquoted uri."""
     with suppress(AttributeError):
@@ -226,10 +294,30 @@ def fix_times(info):
         while info["start_time"] > info["end_time"]:
             info["end_time"] += datetime.timedelta(days=1)
 
+
+@lru_cache(maxsize=64)
+def _compile_glob(file_pattern):
+    """Compile the glob `file_pattern` to a regular expression matcher, so that it is only translated once."""
+    return re.compile(fnmatch.translate(file_pattern)).match
+
+
+def _match_glob(file_pattern, path):
+    """Check that `path` matches the glob `file_pattern`, and return empty metadata."""
+    if _compile_glob(file_pattern)(path) is None:
+        raise ValueError("String does not match pattern.")
+    return {}
+
+
 def parse_metadata(file_pattern, path):
-    """Parse metadata from the filename."""
+    """Parse metadata from the filename.
+
+    If `file_pattern` does not contain any trollsift field, it is used as a glob pattern and the metadata is empty.
+    """
     if file_pattern is not None:
-        file_metadata = parse(file_pattern, path)
+        if "{" in file_pattern:
+            file_metadata = parse(file_pattern, path)
+        else:
+            file_metadata = _match_glob(file_pattern, path)
         fix_times(file_metadata)
     else:
         file_metadata = {}
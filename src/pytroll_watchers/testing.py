@@ -9,15 +9,18 @@ import responses
 import yaml
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def patched_local_events(monkeypatch):
     """Patch the events produced by underlying os/polling watcher.
 
+    The fixture has to be requested explicitly by the tests using it.
+
     Example:
         The produced context managed can be used like this:
 
-        >>> with patched_local_events(["/tmp/file1", "/tmp/file2"]):
-        ...    assert "/tmp/file1" in local_watcher.file_generator("/tmp")
+        >>> def test_something(patched_local_events):
+        ...     with patched_local_events(["/tmp/file1", "/tmp/file2"]):
+        ...         assert "/tmp/file1" in local_watcher.file_generator("/tmp")
 
     """
     @contextmanager
@@ -30,26 +33,34 @@ def patched_local_events(monkeypatch):
     return _patched_local_events
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def patched_bucket_listener(monkeypatch):
     """Patch the records produced by the underlying bucket listener.
 
+    The fixture has to be requested explicitly by the tests using it. The cache of minio clients is cleared when
+    leaving the context manager.
+
     Example:
         This context manager can be used like this:
 
-        >>> with patched_bucket_listener(records_to_produce):
-        ...     for record in bucket_notification_watcher.file_generator(endpoint, bucket):
-        ...         # do something with the record
+        >>> def test_something(patched_bucket_listener):
+        ...     with patched_bucket_listener(records_to_produce):
+        ...         for record in bucket_notification_watcher.file_generator(endpoint, bucket):
+        ...             # do something with the record
 
     """
     @contextmanager
     def _patched_bucket_listener(records):
-        #from unittest import mock
         def fake_listen(*args, **kwargs):
             return nullcontext(enter_result=records)
         import minio
+
+        from pytroll_watchers import minio_notification_watcher
         monkeypatch.setattr(minio.Minio, "listen_bucket_notification", fake_listen)
-        yield
+        try:
+            yield
+        finally:
+            minio_notification_watcher.clear_cache()
     return _patched_bucket_listener
 
 
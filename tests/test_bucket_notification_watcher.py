@@ -1,6 +1,10 @@
 """Tests for the bucket notification watcher."""
 
+import copy
 import datetime
+import json
+from contextlib import nullcontext
+from pathlib import Path
 from unittest import mock
 
 import pytest
@@ -12,11 +16,19 @@ from pytroll_watchers import minio_notification_watcher
 from pytroll_watchers.publisher import SecurityError, fix_times
 from pytroll_watchers.testing import patched_bucket_listener  # noqa
 
+
+@pytest.fixture(scope="session")
+def records():
+    """Get the bucket notifications to simulate, loaded once per test session."""
+    with open(Path(__file__).parent / "bucket_notifications.json") as fd:
+        return json.load(fd)
+
+
 sdr_file_pattern = ("sdr/SV{channel_name:3s}_{platform_name}_d{start_date:%Y%m%d}_t{start_time:%H%M%S%f}_"
                     "e{end_time:%H%M%S%f}_b{orbit_number:d}_c{processing_datetime:%Y%m%d%H%M%S%f}_cspp_dev.h5")
 
 
-def test_generate_paths(patched_bucket_listener):  # noqa
+def test_generate_paths(patched_bucket_listener, records):  # noqa
     """Test generating paths."""
     profile="someprofile"
     s3_config = dict(endpoint_url="someendpoint",
@@ -29,12 +41,131 @@ def test_generate_paths(patched_bucket_listener):  # noqa
     assert path == UPath("s3://viirs-data/sdr/SVM13_npp_d20240408_t1006227_e1007469_b64498_c20240408102334392250_cspp_dev.h5",
                          profile=profile)
 
-def test_generate_paths_uses_credentials_from_profile(patched_bucket_listener, monkeypatch):  # noqa
-    """Test generating paths."""
+def test_generate_paths_with_pattern_filters_on_prefix_server_side(monkeypatch):
+    """Test that the static part of the pattern is passed as prefix to the bucket listener."""
+    import minio
+    fake_listen = mock.MagicMock(return_value=nullcontext(enter_result=[]))
+    monkeypatch.setattr(minio.Minio, "listen_bucket_notification", fake_listen)
+
+    _ = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data", file_pattern=sdr_file_pattern))
+    assert fake_listen.call_args.kwargs["prefix"] == "sdr/SV"
+
+
+def test_generate_paths_reconnects_on_connection_errors(monkeypatch, caplog, records):
+    """Test that the bucket listener reconnects when the connection is lost."""
+    import minio
+    fake_listen = mock.MagicMock(side_effect=[ConnectionError("Lost connection to the server."),
+                                              ConnectionError("Lost connection to the server."),
+                                              nullcontext(enter_result=records)])
+    monkeypatch.setattr(minio.Minio, "listen_bucket_notification", fake_listen)
+    fake_sleep = mock.Mock()
+    monkeypatch.setattr(minio_notification_watcher.time, "sleep", fake_sleep)
+
+    caplog.set_level("WARNING")
+    files = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data"))
+    assert len(files) == len(records)
+    assert fake_sleep.call_args_list == [mock.call(1), mock.call(2)]
+    assert "reconnecting in 2 seconds" in caplog.text
+
+
+def test_generate_paths_skips_duplicate_notifications(patched_bucket_listener, records):  # noqa
+    """Test that notifications delivered twice for the same object version are only yielded once."""
+    with patched_bucket_listener(records[:3] + records[:2]):
+        files = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data"))
+    assert len(files) == 3
+
+
+def test_generate_paths_without_deduplication(patched_bucket_listener, records):  # noqa
+    """Test that deduplication can be switched off."""
+    with patched_bucket_listener(records[:3] + records[:2]):
+        files = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data", deduplication_size=0))
+    assert len(files) == 5
+
+
+def test_generate_paths_deduplication_forgets_old_notifications(patched_bucket_listener, records):  # noqa
+    """Test that only the last `deduplication_size` notifications are remembered."""
+    with patched_bucket_listener(records[:3] + records[:1]):
+        files = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data", deduplication_size=2))
+    assert len(files) == 4
+
+
+def test_generate_paths_with_glob_pattern(patched_bucket_listener, records):  # noqa
+    """Test generating paths with a pattern that has no fields."""
+    s3_config = dict(endpoint_url="someendpoint",
+                     bucket_name="viirs-data",
+                     file_pattern="sdr/SVI*_cspp_dev.h5")
+    with patched_bucket_listener(records):
+        files = list(minio_notification_watcher.file_generator(**s3_config))
+    assert len(files) == 5
+    assert all(path.name.startswith("SVI") and metadata == {} for path, metadata in files)
+
+
+def test_glob_pattern_prefix_stops_at_wildcards(monkeypatch):
+    """Test that the prefix sent to the server stops at the first wildcard."""
+    import minio
+    fake_listen = mock.MagicMock(return_value=nullcontext(enter_result=[]))
+    monkeypatch.setattr(minio.Minio, "listen_bucket_notification", fake_listen)
+
+    _ = list(minio_notification_watcher.file_generator("someendpoint", "viirs-data", file_pattern="sdr/SV?01*.h5"))
+    assert fake_listen.call_args.kwargs["prefix"] == "sdr/SV"
+
+
+def test_generate_paths_raises_after_too_many_reconnections(monkeypatch):
+    """Test that errors from the bucket listener reach the caller of the generator when reconnecting fails."""
+    import minio
+
+    def failing_listen(*args, **kwargs):
+        raise ConnectionError("Lost connection to the server.")
+    monkeypatch.setattr(minio.Minio, "listen_bucket_notification", failing_listen)
+    fake_sleep = mock.Mock()
+    monkeypatch.setattr(minio_notification_watcher.time, "sleep", fake_sleep)
+
+    with pytest.raises(ConnectionError, match="Lost connection"):
+        list(minio_notification_watcher.file_generator("someendpoint", "viirs-data",
+                                                       max_reconnection_attempts=3,
+                                                       max_reconnection_delay=3))
+    assert fake_sleep.call_args_list == [mock.call(1), mock.call(2), mock.call(3)]
+
+
+@pytest.fixture
+def fake_minio(monkeypatch):
+    """Replace the minio client class with a mock, making sure no client is cached before or after the test."""
     import minio
     fake_minio = mock.MagicMock()
     monkeypatch.setattr(minio, "Minio", fake_minio)
+    minio_notification_watcher.clear_cache()
+    yield fake_minio
+    minio_notification_watcher.clear_cache()
+
+
+def test_generate_paths_from_multiple_buckets(monkeypatch, records):
+    """Test generating paths from several buckets at once."""
+    import minio
+
+    def fake_listen(self, bucket_name, **kwargs):
+        return nullcontext(enter_result=[_in_bucket(record, bucket_name) for record in records[:3]])
+    monkeypatch.setattr(minio.Minio, "listen_bucket_notification", fake_listen)
+
+    files = list(minio_notification_watcher.multi_bucket_file_generator("someendpoint", ["viirs-data", "other"]))
+    assert len(files) == 6
+    assert {path.parts[0] for path, _ in files} == {"viirs-data/", "other/"}
+
 
+def _in_bucket(record, bucket_name):
+    record = copy.deepcopy(record)
+    record["Records"][0]["s3"]["bucket"]["name"] = bucket_name
+    return record
+
+
+def test_generate_paths_from_too_many_buckets_raises():
+    """Test that listening to more buckets than the server allows raises an error."""
+    bucket_names = [f"bucket{i}" for i in range(minio_notification_watcher.MAX_LISTENERS + 1)]
+    with pytest.raises(ValueError, match="Cannot listen to more than"):
+        next(minio_notification_watcher.multi_bucket_file_generator("someendpoint", bucket_names))
+
+
+def test_generate_paths_uses_credentials_from_profile(patched_bucket_listener, fake_minio, records):  # noqa
+    """Test generating paths."""
     profile="someprofile"
     s3_config = dict(endpoint_url="someendpoint",
                      bucket_name="viirs-data",
@@ -45,7 +176,18 @@ def test_generate_paths_uses_credentials_from_profile(patched_bucket_listener, m
     assert fake_minio.mock_calls[0][2]["credentials"] is not None
 
 
-def test_generate_paths_with_pattern(patched_bucket_listener):  # noqa
+def test_generate_paths_reuses_client(patched_bucket_listener, fake_minio, records):  # noqa
+    """Test that the minio client is reused between generators on the same endpoint."""
+    s3_config = dict(endpoint_url="someendpoint",
+                     bucket_name="viirs-data",
+                     storage_options=dict(profile="someprofile"))
+    with patched_bucket_listener(records):
+        _ = list(minio_notification_watcher.file_generator(**s3_config))
+        _ = list(minio_notification_watcher.file_generator(**s3_config))
+    assert fake_minio.call_count == 1
+
+
+def test_generate_paths_with_pattern(patched_bucket_listener, records):  # noqa
     """Test generating paths."""
     profile = "someprofile"
     s3_config = dict(endpoint_url="someendpoint",
@@ -61,7 +203,7 @@ def test_generate_paths_with_pattern(patched_bucket_listener):  # noqa
     assert metadata["platform_name"] == "npp"
 
 
-def test_generate_paths_with_pattern_fixes_endtime(patched_bucket_listener):  # noqa
+def test_generate_paths_with_pattern_fixes_endtime(patched_bucket_listener, records):  # noqa
     """Test generating paths."""
     s3_config = dict(endpoint_url="someendpoint",
                      bucket_name="viirs-data",
@@ -89,7 +231,7 @@ def test_fix_times():
     assert metadata["start_time"] < metadata["end_time"]
 
 
-def test_publish_paths(patched_bucket_listener, caplog):  # noqa
+def test_publish_paths(patched_bucket_listener, caplog, records):  # noqa
     """Test publishing paths."""
     s3_config = dict(endpoint_url="someendpoint",
                      bucket_name="viirs-data",
@@ -114,7 +256,56 @@ def test_publish_paths(patched_bucket_listener, caplog):  # noqa
     assert "Starting watch on 'viirs-data'" in caplog.text
 
 
-def test_publish_paths_forbids_passing_secret_key(patched_bucket_listener):  # noqa
+def test_publish_batched_paths_warns_when_not_publishing_datasets(patched_bucket_listener, caplog, records):  # noqa
+    """Test that batching is ignored with a warning when not publishing datasets."""
+    s3_config = dict(endpoint_url="someendpoint",
+                     bucket_name="viirs-data",
+                     storage_options=dict(profile="someprofile"),
+                     batch_size=5,
+                     commit_timeout=10)
+    publisher_settings = dict(nameservers=False, port=1979)
+    message_settings = dict(subject="/segment/viirs/l1b/", atype="file", data=dict(sensor="viirs"))
+
+    with patched_publisher() as messages:
+       with patched_bucket_listener(records):
+            minio_notification_watcher.file_publisher(dict(fs_config=s3_config,
+                                                           publisher_config=publisher_settings,
+                                                           message_config=message_settings))
+    assert "Batching has no effect" in caplog.text
+    assert len(messages) == len(records)
+    message = Message(rawstr=messages[-1])
+    assert message.data["uid"] == "IVCDB_npp_d20240408_t1006227_e1007469_b64498_c20240408102333190566_cspp_dev.h5"
+
+
+def test_publish_batched_paths_as_datasets(patched_bucket_listener, records):  # noqa
+    """Test publishing batches of paths as dataset messages."""
+    s3_config = dict(endpoint_url="someendpoint",
+                     bucket_name="viirs-data",
+                     file_pattern=sdr_file_pattern,
+                     storage_options=dict(profile="someprofile"),
+                     batch_size=4)
+    publisher_settings = dict(nameservers=False, port=1979)
+    message_settings = dict(subject="/segment/viirs/l1b/", atype="dataset", data=dict(sensor="viirs"))
+
+    with patched_publisher() as messages:
+       with patched_bucket_listener(records):
+            minio_notification_watcher.file_publisher(dict(fs_config=s3_config,
+                                                           publisher_config=publisher_settings,
+                                                           message_config=message_settings))
+    assert len(messages) == 3
+    message = Message(rawstr=messages[0])
+    assert message.type == "dataset"
+    assert message.data["platform_name"] == "npp"
+    assert message.data["orbit_number"] == 64498
+    assert message.data["start_time"] == datetime.datetime(2024, 4, 8, 10, 6, 22, 700000)
+    assert "channel_name" not in message.data
+    assert "processing_datetime" not in message.data
+    assert "uri" not in message.data
+    assert [item["uid"][:5] for item in message.data["dataset"]] == ["SVM13", "SVM14", "SVM15", "SVM16"]
+    assert message.data["dataset"][0]["filesystem"]["profile"] == "someprofile"
+
+
+def test_publish_paths_forbids_passing_secret_key(patched_bucket_listener, records):  # noqa
     """Test publishing paths forbids passing a secret key."""
     secret_key = "very secret"  # noqa
     s3_config = dict(endpoint_url="someendpoint",
@@ -132,7 +323,7 @@ def test_publish_paths_forbids_passing_secret_key(patched_bucket_listener):  # n
                                                                message_config=message_settings))
 
 
-def test_publish_paths_with_pattern(patched_bucket_listener):  # noqa
+def test_publish_paths_with_pattern(patched_bucket_listener, records):  # noqa
     """Test publishing paths."""
     s3_config = dict(endpoint_url="someendpoint",
                      bucket_name="viirs-data",
@@ -150,7 +341,7 @@ def test_publish_paths_with_pattern(patched_bucket_listener):  # noqa
     assert message.data["platform_name"] == "npp"
 
 
-def test_publish_paths_with_pattern_and_aliases(patched_bucket_listener):  # noqa
+def test_publish_paths_with_pattern_and_aliases(patched_bucket_listener, records):  # noqa
     """Test publishing paths."""
     s3_config = dict(endpoint_url="someendpoint",
                      bucket_name="viirs-data",
@@ -167,486 +358,3 @@ def test_publish_paths_with_pattern_and_aliases(patched_bucket_listener):  # noq
     message = Message(rawstr=messages[0])
     assert message.data["sensor"] == "viirs"
     assert message.data["platform_name"] == "Suomi-NPP"
-
-
-records = \
-[{"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:22.544Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470908962A15",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "9f6fbbf9e2b44509afa922b8d9884682",
-                                 "key":
-                                 "sdr/SVM13_npp_d20240408_t1006227_e1007469_b64498_c20240408102334392250_cspp_dev.h5",
-                                 "sequencer": "17C447090F3AB797",
-                                 "size": 22183568,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:22.666Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470912FB48E9",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "f92d4f4c1b33b8397fc710aed80ab134",
-                                 "key":
-                                 "sdr/SVM14_npp_d20240408_t1006227_e1007469_b64498_c20240408102334431798_cspp_dev.h5",
-                                 "sequencer": "17C4470916824E6A",
-                                 "size": 12357960,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:22.790Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C447091A7B932E",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "9ffffd85b277704d0b85ecc22d8337ce",
-                                 "key":
-                                 "sdr/SVM15_npp_d20240408_t1006227_e1007469_b64498_c20240408102334471520_cspp_dev.h5",
-                                 "sequencer": "17C447091DE5AEA9",
-                                 "size": 12357960,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:22.925Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470921D01846",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "a7cea3e72dea4845905922a851fac53c",
-                                 "key":
-                                 "sdr/SVM16_npp_d20240408_t1006227_e1007469_b64498_c20240408102334509150_cspp_dev.h5",
-                                 "sequencer": "17C4470925EB97C5",
-                                 "size": 12357960,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:CompleteMultipartUpload",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:25.377Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"content-length": "518",
-                                    "x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C44709B7B42BA6",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "6accbb0d6937313fb06b5c09a88b0045-7",
-                                 "key":
-                                 "sdr/GIMGO_npp_d20240408_t1006227_e1007469_b64498_c20240408102307309287_cspp_dev.h5",
-                                 "sequencer": "17C44709B802FBCF",
-                                 "size": 324490832,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:CompleteMultipartUpload",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:27.829Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"content-length": "518",
-                                    "x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470A4A03BE3D",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "36a554f5a2f344ed5f3ffb7826f0a17a-7",
-                                 "key":
-                                 "sdr/GITCO_npp_d20240408_t1006227_e1007469_b64498_c20240408102307123064_cspp_dev.h5",
-                                 "sequencer": "17C4470A4A2E9DF0",
-                                 "size": 324490848,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:28.227Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470A55A65AC6",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "c5804716bfa4431e35957308d0266b37",
-                                 "key":
-                                 "sdr/SVI01_npp_d20240408_t1006227_e1007469_b64498_c20240408102333369886_cspp_dev.h5",
-                                 "sequencer": "17C4470A61DAC380",
-                                 "size": 49222736,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:28.605Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470A6C179370",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "6e0465a1a67e401d08312d511e14b797",
-                                 "key":
-                                 "sdr/SVI02_npp_d20240408_t1006227_e1007469_b64498_c20240408102333521003_cspp_dev.h5",
-                                 "sequencer": "17C4470A7877A613",
-                                 "size": 49222736,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:28.998Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470A8318051B",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "f7a1a9089841e810a4249ee43ac7d344",
-                                 "key":
-                                 "sdr/SVI03_npp_d20240408_t1006227_e1007469_b64498_c20240408102333616593_cspp_dev.h5",
-                                 "sequencer": "17C4470A8FCB6DF1",
-                                 "size": 49222736,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:29.475Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470A99695857",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "ade56421a7d2b40a27ac32312d496c99",
-                                 "key":
-                                 "sdr/SVI04_npp_d20240408_t1006227_e1007469_b64498_c20240408102333718056_cspp_dev.h5",
-                                 "sequencer": "17C4470AAC4C3A1E",
-                                 "size": 49222736,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:29.881Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470AB6F25E72",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "70c7e8e51601a450c5cd73b3d6e2d57e",
-                                 "key":
-                                 "sdr/SVI05_npp_d20240408_t1006227_e1007469_b64498_c20240408102333815418_cspp_dev.h5",
-                                 "sequencer": "17C4470AC47FA93E",
-                                 "size": 49222736,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:CompleteMultipartUpload",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:31.138Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"content-length": "518",
-                                    "x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470B0F539914",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "8cfd404cd0a9fde9088ebb8472c0eb7d-4",
-                                 "key":
-                                 "sdr/GDNBO_npp_d20240408_t1006227_e1007469_b64498_c20240408102306939475_cspp_dev.h5",
-                                 "sequencer": "17C4470B0F75A541",
-                                 "size": 168652400,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:Put",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:31.293Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470B143343A8",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "45a903f620151c6e84b3dcabc7662692",
-                                 "key":
-                                 "sdr/SVDNB_npp_d20240408_t1006227_e1007469_b64498_c20240408102332971066_cspp_dev.h5",
-                                 "sequencer": "17C4470B18B25911",
-                                 "size": 15662132,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]},
- {"Records": [{"awsRegion": "",
-               "eventName": "s3:ObjectCreated:CompleteMultipartUpload",
-               "eventSource": "minio:s3",
-               "eventTime": "2024-04-08T10:24:32.244Z",
-               "eventVersion": "2.0",
-               "requestParameters": {"principalId": "someuser",
-                                     "region": "",
-                                     "sourceIPAddress": "172.29.4.164"},
-               "responseElements": {"content-length": "518",
-                                    "x-amz-id-2": "b675f5c02385af78c69266a96b22038bea3ecd7423814977a7267fd68ac2bbeb",
-                                    "x-amz-request-id": "17C4470B5138A602",
-                                    "x-minio-deployment-id": "a287d091-5b07-4b97-90c7-856aca7e9543",
-                                    "x-minio-origin-endpoint": "https://172.31.28.90:443"},
-               "s3": {"bucket": {"arn": "arn:aws:s3:::viirs-data",
-                                 "name": "viirs-data",
-                                 "ownerIdentity": {"principalId": "someuser"}},
-                      "configurationId": "Config",
-                      "object": {"contentType": "application/x-hdf5",
-                                 "eTag": "fea57bce523e03c1cc38d864beb8a3d5-3",
-                                 "key":
-                                 "sdr/IVCDB_npp_d20240408_t1006227_e1007469_b64498_c20240408102333190566_cspp_dev.h5",
-                                 "sequencer": "17C4470B515E6945",
-                                 "size": 123520808,
-                                 "userMetadata": {"content-type": "application/x-hdf5"}},
-                      "s3SchemaVersion": "1.0"},
-               "source": {"host": "172.29.4.164",
-                          "port": "",
-                          "userAgent": "aiobotocore/2.12.1 md/Botocore#1.34.51 "
-                                       "ua/2.0 "
-                                       "os/linux#4.18.0-513.18.1.el8_9.x86_64 "
-                                       "md/arch#x86_64 lang/python#3.11.8 "
-                                       "md/pyimpl#CPython "
-                                       "cfg/retry-mode#legacy "
-                                       "botocore/1.34.51"},
-               "userIdentity": {"principalId": "someuser"}}]}]
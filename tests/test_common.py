@@ -0,0 +1,71 @@
+"""Tests for the common functions."""
+
+import time
+
+import pytest
+
+from pytroll_watchers.common import batched, merge_batched, prefetch
+
+
+def _closable_source(items, state):
+    try:
+        yield from items
+    finally:
+        state["closed"] = True
+
+
+def test_prefetch_yields_all_items():
+    """Test that prefetching yields all the items in order."""
+    assert list(prefetch(iter(range(10)), maxsize=2)) == list(range(10))
+
+
+def test_prefetch_reraises_errors():
+    """Test that errors from the source are raised in the consumer."""
+    def failing_source():
+        yield 1
+        raise ConnectionError("Lost connection.")
+
+    generator = prefetch(failing_source())
+    assert next(generator) == 1
+    with pytest.raises(ConnectionError, match="Lost connection"):
+        next(generator)
+
+
+def test_prefetch_closes_source_when_consumer_stops():
+    """Test that the source is closed when the consumer stops iterating."""
+    state = {}
+    generator = prefetch(_closable_source(range(100), state), maxsize=1)
+    assert next(generator) == 0
+    generator.close()
+
+    deadline = time.monotonic() + 5
+    while "closed" not in state and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert state["closed"]
+
+
+def test_batched_groups_items_by_batch_size():
+    """Test that items are grouped in batches of the given size."""
+    assert list(batched(iter(range(10)), 4)) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_batched_yields_partial_batch_after_commit_timeout():
+    """Test that a partial batch is yielded when the commit timeout expires, without waiting for the next item."""
+    def slow_source():
+        yield 1
+        yield 2
+        time.sleep(2)
+        yield 3
+
+    start = time.monotonic()
+    generator = batched(slow_source(), 10, commit_timeout=0.2)
+    assert next(generator) == [1, 2]
+    assert time.monotonic() - start < 1
+    assert next(generator) == [3]
+
+
+def test_merge_batched_groups_items_from_all_iterables():
+    """Test that the items of several iterables are grouped in batches together."""
+    batches = list(merge_batched([iter(range(5)), iter(range(5, 10))], 4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert sorted(item for batch in batches for item in batch) == list(range(10))